@@ -1,46 +1,129 @@
+"""Simple help desk ticketing system (CLI).
+
+Run with `python helpdesk_system.py` (or `pypy3 helpdesk_system.py`, pure Python
+and JIT-friendly). `--pretty` prints the stored tickets as indented JSON.
+Requires Python 3.10+ (slotted dataclasses).
+"""
+import argparse
 import json
+import bisect
 import datetime
+import time
 import os
-import getpass
-from typing import Dict, List, Optional
+import sys
+import mmap
+import hashlib
+import hmac
+import secrets
+import operator
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import InitVar, dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional
+
+orjson = None
+# orjson is a CPython extension; on PyPy the JIT-compiled stdlib json is used instead
+if sys.implementation.name == "cpython":
+    try:
+        import orjson
+    except ImportError:  # optional, falls back to the standard json module
+        pass
+
+# Parse one JSON document from bytes (bound once: called per journal line)
+_loads = orjson.loads if orjson is not None else json.loads
 
 # File constants
-TICKETS_FILE = "tickets.json"
+TICKETS_FILE = "tickets.jsonl"
+LEGACY_TICKETS_FILE = "tickets.json"  # migrated once, then renamed to tickets.json.bak
 USERS_FILE = "users.json"
 CURRENT_USER = None
 
+# Files at least this big are mmapped instead of read into a bytes copy
+_MMAP_THRESHOLD = 1 << 20
+# The tickets journal is compacted once it grows past 4x its last snapshot (and this size)
+_COMPACT_MIN_BYTES = 1 << 16
+# scrypt cost for new password hashes (~16 MiB, tens of ms per login)
+_SCRYPT_PARAMS = {"name": "scrypt", "n": 1 << 14, "r": 8, "p": 1}
+
+# Field values, in display order
+_PRIORITIES = ("low", "medium", "high")
+_STATUSES = ("new", "in_progress", "resolved")
+_ROLES = ("admin", "user")
+
+# Valid field values
+_VALID_PRIORITIES = frozenset(_PRIORITIES)
+_VALID_STATUSES = frozenset(_STATUSES)
+_VALID_ROLES = frozenset(_ROLES)
+_VALID_PRIORITIES_STR = ", ".join(_PRIORITIES)
+_VALID_STATUSES_STR = ", ".join(_STATUSES)
+
+# Sort orders (priority: highest first)
+_PRIORITY_ORDER = {priority: rank for rank, priority in enumerate(reversed(_PRIORITIES))}
+_STATUS_ORDER = {status: rank for rank, status in enumerate(_STATUSES)}
+
+# Display
+_STATUS_ICON = {"new": "🟢", "in_progress": "🟡", "resolved": "🔵"}
+
+# In-memory caches, invalidated by the file's st_mtime_ns
+_TICKETS_CACHE = {"mtime": None, "data": None, "dirty": False, "pending": [], "size": 0, "base_size": 0,
+                  "rewrite": False, "renumbered": [], "fd": None, "fd_key": None,
+                  "by_id": {}, "by_reporter": {}, "indexed": None, "next_id": 1,
+                  "search_blobs": [], "search_corpus": None}
+_USERS_CACHE = {"mtime": None, "data": None, "dirty": False, "by_name": {}, "indexed": None}
+_buffer_depth = 0
+
+def _hash_password(password: str, salt: str, kdf: Dict) -> str:
+    """scrypt digest of a password, using the salt and cost parameters stored with the user"""
+    return hashlib.scrypt(password.encode("utf-8"), salt=bytes.fromhex(salt),
+                          n=kdf["n"], r=kdf["r"], p=kdf["p"]).hex()
+
+@dataclass(slots=True)
 class User:
-    def __init__(self, username: str, password: str, role: str):
-        self.username = username
-        self.password = password
-        self.role = role
+    username: str
+    password: InitVar[str]
+    role: str
+    salt: str = field(init=False)
+    kdf: Dict = field(init=False)
+    password_hash: str = field(init=False)
+    
+    def __post_init__(self, password: str):
+        self.salt = secrets.token_hex(16)
+        self.kdf = dict(_SCRYPT_PARAMS)
+        self.password_hash = _hash_password(password, self.salt, self.kdf)
     
     def to_dict(self) -> Dict:
         return {
             "username": self.username,
-            "password": self.password,
+            "salt": self.salt,
+            "kdf": self.kdf,
+            "password_hash": self.password_hash,
             "role": self.role
         }
 
+@dataclass(slots=True)
 class Ticket:
-    def __init__(self, title: str, description: str, priority: str, reporter: str):
+    title: str
+    description: str
+    priority: str
+    reporter: str
+    id: str = field(init=False)
+    status: str = field(init=False, default="new")
+    created_ts: int = field(init=False, default_factory=time.time_ns)
+    created_date: str = field(init=False)
+    comments: List[Dict] = field(init=False, default_factory=list)
+    
+    def __post_init__(self):
         self.id = self._generate_ticket_id()
-        self.title = title
-        self.description = description
-        self.priority = priority
-        self.reporter = reporter
-        self.status = "new"
-        self.created_date = datetime.datetime.now().isoformat()
-        self.comments = []
+        self.created_date = datetime.datetime.fromtimestamp(self.created_ts / 1e9).isoformat()
     
     def _generate_ticket_id(self) -> str:
-        """Generate unique ticket ID: TKT-XXX"""
-        tickets = load_tickets()
-        next_number = len(tickets) + 1
-        return f"TKT-{next_number:03d}"
+        """Generate unique ticket ID: TKT-XXX (never reused after deletes)"""
+        load_tickets()
+        return _next_ticket_id()
     
     def to_dict(self) -> Dict:
         """Convert ticket object to dictionary for JSON storage"""
+        # Explicit keys (like dataclasses' own generated code); asdict() would deep-copy
         return {
             "id": self.id,
             "title": self.title,
@@ -49,66 +132,471 @@ class Ticket:
             "reporter": self.reporter,
             "status": self.status,
             "created_date": self.created_date,
+            "created_ts": self.created_ts,
             "comments": self.comments
         }
 
 # ==================== DATA STORAGE FUNCTIONS ====================
-def load_tickets() -> List[Dict]:
-    """Load tickets from JSON file"""
+def _file_mtime(path: str) -> Optional[int]:
+    """Return file mtime in nanoseconds, or None if the file does not exist"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def _read_json(path: str) -> object:
+    """Parse a JSON file; with orjson, large files are parsed straight from an mmap"""
+    with open(path, 'rb') as f:
+        if orjson is None:
+            return json.loads(f.read())
+        if os.fstat(f.fileno()).st_size < _MMAP_THRESHOLD:
+            return orjson.loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+            return orjson.loads(view)
+
+def _load_cached(path: str, cache: Dict, read: Callable[[str], List[Dict]]) -> List[Dict]:
+    """Load list from file via read(), re-parsing only when the file has changed"""
+    # Unsaved changes inside buffered() always win over the file on disk
+    if cache["dirty"] or cache.get("pending"):
+        return cache["data"]
+    
+    mtime = _file_mtime(path)
+    if cache["data"] is not None and cache["mtime"] == mtime:
+        return cache["data"]
+    
+    try:
+        data = read(path)
+    except (FileNotFoundError, ValueError):  # JSON errors (incl. orjson's) and bad UTF-8
+        data = []
+    
+    cache["mtime"] = mtime
+    cache["data"] = data
+    return data
+
+def _dumps(data: object) -> bytes:
+    """Serialize data to compact JSON in one call (one write instead of one per token)"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+def _atomic_write(path: str, payload: bytes) -> None:
+    """Write payload to a temp file and rename it over path (no truncated files on crash)"""
+    tmp_path = path + ".tmp"
     try:
-        with open(TICKETS_FILE, 'r') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        # e.g. disk full: keep the old file and don't leave a half-written temp behind
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+def _dumps_line(data: object) -> bytes:
+    """Serialize data to one compact JSON line (journal format)"""
+    return _dumps(data) + b"\n"
+
+def _save_cached(path: str, cache: Dict, data: List[Dict]) -> None:
+    """Write JSON list to file, or only mark it dirty inside buffered()"""
+    cache["data"] = data
+    if _buffer_depth > 0:
+        cache["dirty"] = True
+        return
+    
+    _atomic_write(path, _dumps(data))
+    cache["mtime"] = _file_mtime(path)
+    cache["dirty"] = False
+
+def _position(items: List[Dict], item: Dict) -> int:
+    """Position of item in items by identity (list.index compares whole dicts)"""
+    return next(i for i, candidate in enumerate(items) if candidate is item)
+
+def _ticket_number(ticket_id: str) -> int:
+    """Numeric part of a TKT-XXX id (0 if malformed)"""
+    try:
+        return int(ticket_id.rsplit("-", 1)[-1])
+    except ValueError:
+        return 0
+
+def _next_ticket_id() -> str:
+    """Take the next ticket ID from the counter"""
+    next_number = _TICKETS_CACHE["next_id"]
+    _TICKETS_CACHE["next_id"] = next_number + 1
+    return f"TKT-{next_number:03d}"
+
+def _decode_legacy_tickets(tickets: List[Dict]) -> List[Dict]:
+    """Take over the old tickets.json list, continuing IDs after its highest one"""
+    _TICKETS_CACHE["next_id"] = max((_ticket_number(t["id"]) for t in tickets), default=0) + 1
+    return tickets
+
+def _apply_event(by_id: Dict[str, Dict], event: Dict) -> Optional[Dict]:
+    """Replay one journal event onto the tickets dict; returns a create whose ID is already taken"""
+    op = event["op"]
+    if op == "ticket":
+        ticket = event["ticket"]
+        if ticket["id"] in by_id:
+            # Snapshots list each ticket once, so this is a second create of the
+            # same ID (two writers racing): leave it to the caller to renumber
+            return ticket
+        by_id[ticket["id"]] = ticket
+        _TICKETS_CACHE["next_id"] = max(_TICKETS_CACHE["next_id"], _ticket_number(ticket["id"]) + 1)
+    elif op == "meta":
+        _TICKETS_CACHE["next_id"] = max(_TICKETS_CACHE["next_id"], event["next_id"])
+    elif op == "delete":
+        by_id.pop(event["id"], None)
+    elif event["id"] in by_id:
+        ticket = by_id[event["id"]]
+        if op == "status":
+            ticket["status"] = event["status"]
+        elif op == "comment":
+            ticket["comments"].append(event["comment"])
+    return None
+
+def _read_tickets(path: str) -> List[Dict]:
+    """Replay the tickets journal (or read the legacy tickets.json if there is none yet)"""
+    _TICKETS_CACHE["next_id"] = 1
+    _TICKETS_CACHE["size"] = _TICKETS_CACHE["base_size"] = 0
+    _TICKETS_CACHE["rewrite"] = False
+    _TICKETS_CACHE["renumbered"] = []
+    if not os.path.exists(path):
+        if os.path.exists(LEGACY_TICKETS_FILE):
+            _TICKETS_CACHE["rewrite"] = True
+            return _decode_legacy_tickets(_read_json(LEGACY_TICKETS_FILE))
         return []
+    
+    by_id = {}
+    duplicates = []
+    with open(path, 'rb') as f:
+        for line in f:
+            try:
+                event = _loads(line)
+            except ValueError:  # JSONDecodeError, or UnicodeDecodeError from the stdlib parser
+                # Torn line after a crash mid-append: skip it, and rewrite the
+                # journal so the next append does not land on the same line
+                _TICKETS_CACHE["rewrite"] = True
+                continue
+            duplicate = _apply_event(by_id, event)
+            if duplicate is not None:
+                duplicates.append(duplicate)
+            _TICKETS_CACHE["size"] += len(line)
+            if event["op"] in ("ticket", "meta"):
+                _TICKETS_CACHE["base_size"] += len(line)
+    
+    # Keep both tickets of an ID collision: the later one gets a fresh ID, made
+    # permanent by the rewrite (load_tickets() reports it once)
+    for ticket in duplicates:
+        old_id = ticket["id"]
+        ticket["id"] = _next_ticket_id()
+        by_id[ticket["id"]] = ticket
+        _TICKETS_CACHE["renumbered"].append((old_id, ticket["id"]))
+        _TICKETS_CACHE["rewrite"] = True
+    return list(by_id.values())
+
+def _search_blob(ticket: Dict) -> str:
+    """Lowercased searchable text of a ticket (id, title, description, reporter)"""
+    return "\0".join((ticket["title"], ticket["description"],
+                      ticket["reporter"], ticket["id"])).lower()
+
+def _backfill_created_ts(tickets: List[Dict]) -> bool:
+    """Add integer created_ts (epoch ns) to older tickets; True if anything changed"""
+    changed = False
+    for ticket in tickets:
+        if "created_ts" not in ticket:
+            created = datetime.datetime.fromisoformat(ticket["created_date"])
+            seconds = int(created.replace(microsecond=0).timestamp())
+            ticket["created_ts"] = seconds * 1_000_000_000 + created.microsecond * 1000
+            changed = True
+    return changed
+
+def _index_tickets(tickets: List[Dict]) -> None:
+    """Rebuild the ticket indexes for a freshly loaded/saved list"""
+    _TICKETS_CACHE["by_id"] = {ticket["id"]: ticket for ticket in tickets}
+    by_reporter = {}
+    intern = sys.intern
+    for ticket in tickets:
+        by_reporter.setdefault(ticket["reporter"], []).append(ticket)
+        # Enum-like fields share one string object each instead of one copy per ticket
+        ticket["status"] = intern(ticket["status"])
+        ticket["priority"] = intern(ticket["priority"])
+    _TICKETS_CACHE["by_reporter"] = by_reporter
+    # Sejajar dengan list tiket (index yang sama)
+    _TICKETS_CACHE["search_blobs"] = [_search_blob(ticket) for ticket in tickets]
+    _TICKETS_CACHE["search_corpus"] = None
+    _TICKETS_CACHE["indexed"] = tickets
+
+def _search_corpus() -> tuple:
+    """All search blobs joined into one string, plus each blob's start offset (lazy)"""
+    if _TICKETS_CACHE["search_corpus"] is None:
+        blobs = _TICKETS_CACHE["search_blobs"]
+        starts = []
+        offset = 0
+        for blob in blobs:
+            starts.append(offset)
+            offset += len(blob) + 1
+        _TICKETS_CACHE["search_corpus"] = ("\n".join(blobs), starts)
+    return _TICKETS_CACHE["search_corpus"]
+
+def _get_ticket_fast(ticket_id: str) -> Optional[Dict]:
+    """O(1) ticket lookup; call load_tickets() first so the index is current"""
+    return _TICKETS_CACHE["by_id"].get(ticket_id)
+
+def get_tickets_by_reporter(reporter: str) -> List[Dict]:
+    """Tickets reported by one user, from the reporter index"""
+    load_tickets()
+    # Selalu list baru, supaya caller tidak mengubah list di index
+    return list(_TICKETS_CACHE["by_reporter"].get(reporter, ()))
+
+def _warn_renumbered(renumbered: List[tuple]) -> None:
+    """Tell the user about tickets that got a new ID after an ID collision"""
+    for old_id, new_id in renumbered:
+        print(f"⚠️ Ticket ID {old_id} was taken by another session; that ticket is now {new_id}",
+              file=sys.stderr)
+
+def load_tickets() -> List[Dict]:
+    """Load tickets from the journal (cached)"""
+    tickets = _load_cached(TICKETS_FILE, _TICKETS_CACHE, _read_tickets)
+    if _TICKETS_CACHE["indexed"] is not tickets:
+        _index_tickets(tickets)
+        # Migrasi dari tickets.json lama / journal rusak: tulis ulang sebagai snapshot
+        if _backfill_created_ts(tickets) or _TICKETS_CACHE["rewrite"]:
+            _warn_renumbered(_TICKETS_CACHE["renumbered"])
+            save_tickets(tickets)
+    return tickets
 
 def save_tickets(tickets: List[Dict]) -> None:
-    """Save tickets to JSON file"""
-    with open(TICKETS_FILE, 'w') as f:
-        json.dump(tickets, f, indent=2)
+    """Replace all tickets (rewrites the journal as a snapshot)"""
+    _TICKETS_CACHE["data"] = tickets
+    if _TICKETS_CACHE["indexed"] is not tickets:
+        _index_tickets(tickets)
+    if _buffer_depth > 0:
+        _TICKETS_CACHE["dirty"] = True
+        return
+    compact_tickets()
 
-def load_users() -> List[Dict]:
-    """Load users from JSON file"""
+def compact_tickets() -> None:
+    """Rewrite the journal as one meta line plus one snapshot line per ticket"""
+    lines = [_dumps_line({"op": "meta", "next_id": _TICKETS_CACHE["next_id"]})]
+    lines.extend(_dumps_line({"op": "ticket", "ticket": ticket}) for ticket in _TICKETS_CACHE["data"])
+    payload = b"".join(lines)
+    
+    # The append fd would point at the replaced file (and blocks os.replace on Windows)
+    _close_journal()
+    _atomic_write(TICKETS_FILE, payload)
+    if os.path.exists(LEGACY_TICKETS_FILE):
+        # Migrated into the journal: keep it only as a backup, so a lost
+        # journal can't silently bring the old tickets back
+        os.replace(LEGACY_TICKETS_FILE, LEGACY_TICKETS_FILE + ".bak")
+    _TICKETS_CACHE["mtime"] = _file_mtime(TICKETS_FILE)
+    _TICKETS_CACHE["size"] = _TICKETS_CACHE["base_size"] = len(payload)
+    _TICKETS_CACHE["dirty"] = False
+    _TICKETS_CACHE["pending"] = []
+    _TICKETS_CACHE["rewrite"] = False
+    _TICKETS_CACHE["renumbered"] = []
+
+def _close_journal() -> None:
+    """Close the cached journal append fd, if open"""
+    fd = _TICKETS_CACHE["fd"]
+    if fd is not None:
+        _TICKETS_CACHE["fd"] = None
+        os.close(fd)
+
+def _journal_fd(st: Optional[os.stat_result]) -> int:
+    """Append-only fd for the journal, kept open across writes; reopened if the file was replaced"""
+    if _TICKETS_CACHE["fd"] is not None and (st is None or (st.st_dev, st.st_ino) != _TICKETS_CACHE["fd_key"]):
+        _close_journal()
+    if _TICKETS_CACHE["fd"] is None:
+        fd = os.open(TICKETS_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+        opened = os.fstat(fd)
+        _TICKETS_CACHE["fd"] = fd
+        _TICKETS_CACHE["fd_key"] = (opened.st_dev, opened.st_ino)
+    return _TICKETS_CACHE["fd"]
+
+def _rebase_events(lines: List[bytes]) -> tuple:
+    """Reload a journal another process wrote to, then re-apply our events on top of it.
+    
+    Our creates whose ID was taken meanwhile get the next free ID (as do later events
+    for them); returns the events to append and the {old_id: new_id} renumbering.
+    """
+    events = [_loads(line) for line in lines]
+    tickets = _read_tickets(TICKETS_FILE)
+    by_id = {ticket["id"]: ticket for ticket in tickets}
+    renumbered = {}
+    for event in events:
+        if event["op"] == "ticket" and event["ticket"]["id"] in by_id:
+            new_id = _next_ticket_id()
+            renumbered[event["ticket"]["id"]] = new_id
+            event["ticket"]["id"] = new_id
+        elif event["op"] != "ticket" and event.get("id") in renumbered:
+            event["id"] = renumbered[event["id"]]
+    # Serialize before replaying: replay mutates the ticket dicts inside create events
+    lines = [_dumps_line(event) for event in events]
+    for event in events:
+        _apply_event(by_id, event)
+    tickets = list(by_id.values())
+    _TICKETS_CACHE["data"] = tickets
+    _index_tickets(tickets)
+    return lines, renumbered
+
+def _write_events(lines: List[bytes]) -> Dict[str, str]:
+    """Append serialized events in one write, compacting the journal when it has grown too much.
+    
+    Returns {old_id: new_id} for created tickets renumbered because another process took their ID.
+    """
     try:
-        with open(USERS_FILE, 'r') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
+        st = os.stat(TICKETS_FILE)
+    except FileNotFoundError:
+        st = None
+    renumbered = {}
+    if (st.st_mtime_ns if st is not None else None) != _TICKETS_CACHE["mtime"]:
+        # Another process wrote the journal too: catch up before appending
+        lines, renumbered = _rebase_events(lines)
+    payload = b"".join(lines)
+    fd = _journal_fd(st)
+    unwritten = memoryview(payload)
+    while unwritten:
+        unwritten = unwritten[os.write(fd, unwritten):]
+    _TICKETS_CACHE["pending"] = []
+    
+    _TICKETS_CACHE["mtime"] = os.fstat(fd).st_mtime_ns
+    _TICKETS_CACHE["size"] += len(payload)
+    if _TICKETS_CACHE["rewrite"]:
+        # The reloaded journal had a torn line or an ID collision of its own
+        _warn_renumbered(_TICKETS_CACHE["renumbered"])
+        compact_tickets()
+    elif _TICKETS_CACHE["size"] > max(4 * _TICKETS_CACHE["base_size"], _COMPACT_MIN_BYTES):
+        compact_tickets()
+    return renumbered
+
+def append_event(*events: Dict) -> Dict[str, str]:
+    """Record ticket changes (already applied to the cache) without rewriting the file.
+    
+    Returns {old_id: new_id} if a created ticket had to be renumbered (see _write_events).
+    """
+    # Serialize now: the event may reference a ticket dict that changes later
+    lines = [_dumps_line(event) for event in events]
+    if _buffer_depth > 0:
+        _TICKETS_CACHE["pending"].extend(lines)
+        return {}
+    return _write_events(lines)
+
+def _index_users(users: List[Dict]) -> None:
+    """Rebuild the username index for a freshly loaded/saved list"""
+    _USERS_CACHE["by_name"] = {user["username"]: user for user in users}
+    for user in users:
+        user["role"] = sys.intern(user["role"])
+    _USERS_CACHE["indexed"] = users
+
+def _upgrade_passwords(users: List[Dict]) -> bool:
+    """Replace legacy plaintext passwords with salted hashes; True if anything changed"""
+    changed = False
+    for user in users:
+        if "password" in user:
+            user["salt"] = secrets.token_hex(16)
+            user["kdf"] = dict(_SCRYPT_PARAMS)
+            user["password_hash"] = _hash_password(user.pop("password"), user["salt"], user["kdf"])
+            changed = True
+    return changed
+
+def load_users() -> List[Dict]:
+    """Load users from JSON file (cached)"""
+    users = _load_cached(USERS_FILE, _USERS_CACHE, _read_json)
+    if _USERS_CACHE["indexed"] is not users:
+        _index_users(users)
+        if _upgrade_passwords(users):
+            save_users(users)
+    return users
 
 def save_users(users: List[Dict]) -> None:
     """Save users to JSON file"""
-    with open(USERS_FILE, 'w') as f:
-        json.dump(users, f, indent=2)
+    _save_cached(USERS_FILE, _USERS_CACHE, users)
+    if _USERS_CACHE["indexed"] is not users:
+        _index_users(users)
+
+def flush() -> None:
+    """Write any buffered ticket/user changes to disk"""
+    if _TICKETS_CACHE["dirty"]:
+        # Full snapshot already contains any pending events
+        compact_tickets()
+    elif _TICKETS_CACHE["pending"]:
+        # The creates were already reported with their old IDs
+        _warn_renumbered(list(_write_events(_TICKETS_CACHE["pending"]).items()))
+    if _USERS_CACHE["dirty"]:
+        _USERS_CACHE["dirty"] = False
+        save_users(_USERS_CACHE["data"])
+
+# Library API for bulk edits (imports, scripts). The interactive menus don't use it on
+# purpose: each change is one small journal append, and a session held in memory would be
+# lost on a kill and would allocate ticket IDs without seeing other processes' writes.
+@contextmanager
+def buffered():
+    """Defer saves until the outermost buffered() block exits (one write per file)"""
+    global _buffer_depth
+    _buffer_depth += 1
+    try:
+        yield
+    finally:
+        _buffer_depth -= 1
+        if _buffer_depth == 0:
+            flush()
 
 def initialize_users():
-    """Initialize default users if not exists"""
-    default_users = [
-        {"username": "admin", "password": "admin123", "role": "admin"},
-        {"username": "tech", "password": "tech123", "role": "admin"},
-        {"username": "user1", "password": "user123", "role": "user"},
-        {"username": "user2", "password": "user123", "role": "user"}
-    ]
-    
-    if not os.path.exists(USERS_FILE):
+    """Initialize default users if not exists, and warm the users cache"""
+    if os.path.exists(USERS_FILE):
+        # Parse (and upgrade plaintext passwords) once, before the first login
+        load_users()
+    else:
+        default_users = [
+            User("admin", "admin123", "admin").to_dict(),
+            User("tech", "tech123", "admin").to_dict(),
+            User("user1", "user123", "user").to_dict(),
+            User("user2", "user123", "user").to_dict()
+        ]
         save_users(default_users)
 
 # ==================== SEARCHING & SORTING FUNCTIONS ====================
-def search_tickets(keyword: str) -> List[Dict]:
-    """Fungsi searching akan memfilter tiket berdasarkan keyword"""
+def search_tickets_iter(keyword: str) -> Iterator[Dict]:
+    """Yield tiket yang cocok dengan keyword, tanpa membuat list baru"""
     tickets = load_tickets()
-    results = []
     
     if not keyword.strip():
-        return tickets
+        yield from tickets
+        return
     
+    # Search in title, description, reporter, dan id (sudah lowercase di cache).
+    # Satu str.find di C atas seluruh corpus, bukan satu `in` per tiket.
+    keyword_lc = keyword.lower()
+    corpus, starts = _search_corpus()
+    blobs = _TICKETS_CACHE["search_blobs"]
+    pos = corpus.find(keyword_lc)
+    
+    while pos != -1:
+        index = bisect.bisect_right(starts, pos) - 1
+        blob_end = starts[index] + len(blobs[index])
+        if pos + len(keyword_lc) <= blob_end:
+            yield tickets[index]
+            pos = corpus.find(keyword_lc, blob_end + 1)
+        else:
+            # Match crosses into the next ticket's blob, not a real hit
+            pos = corpus.find(keyword_lc, pos + 1)
+
+def search_tickets(keyword: str) -> List[Dict]:
+    """Fungsi searching akan memfilter tiket berdasarkan keyword"""
+    # Selalu list baru, supaya caller tidak mengubah list di cache
+    return list(search_tickets_iter(keyword))
+
+def _bucket_sort(tickets: List[Dict], field: str, order: Dict[str, int], ascending: bool) -> List[Dict]:
+    """Stable O(N) sort for fields with a few known values (same result as sorted())"""
+    buckets = [[] for _ in range(len(order))]
     for ticket in tickets:
-        # Search in title, description, dan reporter
-        if (keyword.lower() in ticket['title'].lower() or 
-            keyword.lower() in ticket['description'].lower() or 
-            keyword.lower() in ticket['reporter'].lower() or
-            keyword.lower() in ticket['id'].lower()):
-            results.append(ticket)
+        buckets[order[ticket[field]]].append(ticket)
     
-    return results
+    if not ascending:
+        buckets.reverse()
+    return [ticket for bucket in buckets for ticket in bucket]
 
 def sort_tickets(tickets: List[Dict], sort_by: str, ascending: bool = True) -> List[Dict]:
     """Fungsi sorting akan mengurutkan tiket berdasarkan field yang dipilih"""
@@ -116,13 +604,11 @@ def sort_tickets(tickets: List[Dict], sort_by: str, ascending: bool = True) -> L
         return tickets
         
     if sort_by == "date":
-        key = lambda x: x['created_date']
+        key = operator.itemgetter('created_ts')
     elif sort_by == "priority":
-        priority_order = {"high": 0, "medium": 1, "low": 2}
-        key = lambda x: priority_order[x['priority']]
+        return _bucket_sort(tickets, "priority", _PRIORITY_ORDER, ascending)
     elif sort_by == "status":
-        status_order = {"new": 0, "in_progress": 1, "resolved": 2}
-        key = lambda x: status_order[x['status']]
+        return _bucket_sort(tickets, "status", _STATUS_ORDER, ascending)
     elif sort_by == "title":
         key = lambda x: x['title'].lower()
     else:
@@ -130,21 +616,29 @@ def sort_tickets(tickets: List[Dict], sort_by: str, ascending: bool = True) -> L
     
     return sorted(tickets, key=key, reverse=not ascending)
 
+# ==================== INPUT HELPER ====================
+def _ask(prompt: str, lower: bool = False) -> str:
+    """Read one stripped line of input (lowercased for options like y/n)"""
+    answer = input(prompt).strip()
+    return answer.lower() if lower else answer
+
 # ==================== AUTHENTICATION SYSTEM ====================
 def authenticate_user() -> Optional[Dict]:
     """User authentication system"""
+    import getpass  # only needed once a login prompt is shown
     print("\n🔐 LOGIN")
     print("=" * 20)
     
-    username = input("Username: ").strip()
+    username = _ask("Username: ")
     password = getpass.getpass("Password: ").strip()
     
-    users = load_users()
+    load_users()
+    user = _USERS_CACHE["by_name"].get(username)
     
-    for user in users:
-        if user["username"] == username and user["password"] == password:
-            print(f"✅ Welcome {username}!")
-            return user
+    if user is not None and hmac.compare_digest(
+            user["password_hash"], _hash_password(password, user["salt"], user["kdf"])):
+        print(f"✅ Welcome {username}!")
+        return user
     
     print("❌ Invalid username or password!")
     return None
@@ -155,29 +649,28 @@ def register_user():
         print("❌ Only administrators can register new users!")
         return
     
+    import getpass
     print("\n👤 REGISTER NEW USER")
-    username = input("Username: ").strip()
+    username = _ask("Username: ")
     password = getpass.getpass("Password: ").strip()
-    role = input("Role (admin/user): ").strip().lower()
+    role = _ask("Role (admin/user): ", lower=True)
     
-    if role not in ["admin", "user"]:
+    if role not in _VALID_ROLES:
         print("❌ Role must be 'admin' or 'user'!")
         return
+    role = sys.intern(role)
     
     users = load_users()
     
     # Check if username exists
-    if any(user["username"] == username for user in users):
+    if username in _USERS_CACHE["by_name"]:
         print("❌ Username already exists!")
         return
     
     # Add new user
-    new_user = {
-        "username": username,
-        "password": password,
-        "role": role
-    }
+    new_user = User(username, password, role).to_dict()
     users.append(new_user)
+    _USERS_CACHE["by_name"][username] = new_user
     save_users(users)
     
     print(f"✅ User {username} registered successfully as {role}!")
@@ -189,146 +682,159 @@ def delete_user():
         return
     
     print("\n🗑️ DELETE USER")
-    username = input("Username to delete: ").strip()
+    username = _ask("Username to delete: ")
     
     if username == CURRENT_USER["username"]:
         print("❌ You cannot delete your own account!")
         return
     
     users = load_users()
+    user = _USERS_CACHE["by_name"].get(username)
+    if user is None:
+        print("❌ User not found!")
+        return
     
-    for user in users:
-        if user["username"] == username:
-            # Konfirmasi penghapusan
-            confirm = input(f"Are you sure you want to delete user '{username}'? (y/n): ").strip().lower()
-            if confirm == 'y':
-                users.remove(user)
-                save_users(users)
-                print(f"✅ User {username} deleted successfully!")
-            else:
-                print("❌ User deletion cancelled.")
-            return
-    
-    print("❌ User not found!")
+    # Konfirmasi penghapusan
+    confirm = _ask(f"Are you sure you want to delete user '{username}'? (y/n): ", lower=True)
+    if confirm == 'y':
+        del users[_position(users, user)]
+        del _USERS_CACHE["by_name"][username]
+        save_users(users)
+        print(f"✅ User {username} deleted successfully!")
+    else:
+        print("❌ User deletion cancelled.")
 
 # ==================== CORE TICKET OPERATIONS ====================
 def create_ticket(title: str, description: str, priority: str, reporter: str) -> str:
     """Create a new ticket"""
-    valid_priorities = ["low", "medium", "high"]
-    if priority not in valid_priorities:
-        return f"Error: Priority must be one of {valid_priorities}"
+    if priority not in _VALID_PRIORITIES:
+        return f"Error: Priority must be one of {_VALID_PRIORITIES_STR}"
+    priority = sys.intern(priority)  # same shared object as loaded tickets
     
     new_ticket = Ticket(title, description, priority, reporter)
     ticket_dict = new_ticket.to_dict()
     
     tickets = load_tickets()
     tickets.append(ticket_dict)
-    save_tickets(tickets)
+    _TICKETS_CACHE["by_id"][new_ticket.id] = ticket_dict
+    _TICKETS_CACHE["by_reporter"].setdefault(reporter, []).append(ticket_dict)
+    _TICKETS_CACHE["search_blobs"].append(_search_blob(ticket_dict))
+    _TICKETS_CACHE["search_corpus"] = None
+    renumbered = append_event({"op": "ticket", "ticket": ticket_dict})
     
-    return f"Ticket created! ID: {new_ticket.id}"
+    return f"Ticket created! ID: {renumbered.get(new_ticket.id, new_ticket.id)}"
 
 def get_ticket(ticket_id: str) -> Optional[Dict]:
     """Get ticket by ID"""
-    tickets = load_tickets()
-    for ticket in tickets:
-        if ticket["id"] == ticket_id:
-            return ticket
-    return None
+    load_tickets()
+    return _get_ticket_fast(ticket_id)
 
 def update_ticket_status(ticket_id: str, new_status: str) -> str:
     """Update ticket status"""
-    valid_statuses = ["new", "in_progress", "resolved"]
-    if new_status not in valid_statuses:
-        return f"Error: Status must be one of {valid_statuses}"
-    
-    tickets = load_tickets()
-    for ticket in tickets:
-        if ticket["id"] == ticket_id:
-            ticket["status"] = new_status
-            save_tickets(tickets)
-            return f"Ticket {ticket_id} status updated to {new_status}"
-    
-    return f"Error: Ticket {ticket_id} not found"
+    if new_status not in _VALID_STATUSES:
+        return f"Error: Status must be one of {_VALID_STATUSES_STR}"
+    new_status = sys.intern(new_status)  # same shared object as loaded tickets
+    
+    load_tickets()
+    ticket = _get_ticket_fast(ticket_id)
+    if ticket is None:
+        return f"Error: Ticket {ticket_id} not found"
+    
+    ticket["status"] = new_status
+    append_event({"op": "status", "id": ticket_id, "status": new_status})
+    return f"Ticket {ticket_id} status updated to {new_status}"
 
 def add_comment(ticket_id: str, username: str, message: str) -> str:
     """Add comment to ticket"""
-    tickets = load_tickets()
+    load_tickets()
+    ticket = _get_ticket_fast(ticket_id)
+    if ticket is None:
+        return f"Error: Ticket {ticket_id} not found"
+    
+    comment = {
+        "user": username,
+        "message": message,
+        "timestamp": datetime.datetime.now().isoformat()
+    }
+    ticket["comments"].append(comment)
+    events = [{"op": "comment", "id": ticket_id, "comment": comment}]
     
-    for ticket in tickets:
-        if ticket["id"] == ticket_id:
-            comment = {
-                "user": username,
-                "message": message,
-                "timestamp": datetime.datetime.now().isoformat()
-            }
-            ticket["comments"].append(comment)
-            
-            if ticket["status"] == "new":
-                ticket["status"] = "in_progress"
-            
-            save_tickets(tickets)
-            return f"Comment added to ticket {ticket_id}"
+    if ticket["status"] == "new":
+        ticket["status"] = "in_progress"
+        events.append({"op": "status", "id": ticket_id, "status": "in_progress"})
     
-    return f"Error: Ticket {ticket_id} not found"
+    append_event(*events)
+    return f"Comment added to ticket {ticket_id}"
 
 def delete_ticket(ticket_id: str) -> str:
     """Delete ticket (admin can delete any, user can only delete their own)"""
     tickets = load_tickets()
-    
-    for ticket in tickets:
-        if ticket["id"] == ticket_id:
-            # Check permissions
-            if CURRENT_USER["role"] != "admin" and ticket["reporter"] != CURRENT_USER["username"]:
-                return "❌ You can only delete your own tickets!"
-            
-            # Konfirmasi penghapusan
-            confirm = input(f"Are you sure you want to delete ticket '{ticket_id}'? (y/n): ").strip().lower()
-            if confirm != 'y':
-                return "❌ Ticket deletion cancelled."
-            
-            tickets.remove(ticket)
-            save_tickets(tickets)
-            return f"✅ Ticket {ticket_id} deleted successfully!"
-    
-    return f"❌ Ticket {ticket_id} not found"
+    ticket = _get_ticket_fast(ticket_id)
+    if ticket is None:
+        return f"❌ Ticket {ticket_id} not found"
+    
+    # Check permissions
+    if CURRENT_USER["role"] != "admin" and ticket["reporter"] != CURRENT_USER["username"]:
+        return "❌ You can only delete your own tickets!"
+    
+    # Konfirmasi penghapusan
+    confirm = _ask(f"Are you sure you want to delete ticket '{ticket_id}'? (y/n): ", lower=True)
+    if confirm != 'y':
+        return "❌ Ticket deletion cancelled."
+    
+    index = _position(tickets, ticket)
+    del tickets[index]
+    del _TICKETS_CACHE["search_blobs"][index]
+    _TICKETS_CACHE["search_corpus"] = None
+    del _TICKETS_CACHE["by_id"][ticket_id]
+    reporter_tickets = _TICKETS_CACHE["by_reporter"][ticket["reporter"]]
+    del reporter_tickets[_position(reporter_tickets, ticket)]
+    append_event({"op": "delete", "id": ticket_id})
+    return f"✅ Ticket {ticket_id} deleted successfully!"
 
 # ==================== DISPLAY FUNCTIONS ====================
 def display_ticket(ticket: Dict) -> None:
     """Display ticket details in formatted way"""
-    print(f"\n{'='*40}")
-    print(f"TICKET: {ticket['id']}")
-    print(f"{'='*40}")
-    print(f"Title: {ticket['title']}")
-    print(f"Description: {ticket['description']}")
-    print(f"Status: {ticket['status']} | Priority: {ticket['priority']}")
-    print(f"Reporter: {ticket['reporter']}")
-    print(f"Created: {ticket['created_date'][:16]}")
+    separator = '=' * 40
+    lines = [
+        f"\n{separator}",
+        f"TICKET: {ticket['id']}",
+        separator,
+        f"Title: {ticket['title']}",
+        f"Description: {ticket['description']}",
+        f"Status: {ticket['status']} | Priority: {ticket['priority']}",
+        f"Reporter: {ticket['reporter']}",
+        f"Created: {ticket['created_date'][:16]}",
+    ]
     
     if ticket['comments']:
-        print(f"\nComments ({len(ticket['comments'])}):")
-        for i, comment in enumerate(ticket['comments'], 1):
-            print(f"  {i}. {comment['user']}: {comment['message']}")
+        lines.append(f"\nComments ({len(ticket['comments'])}):")
+        lines.extend(f"  {i}. {comment['user']}: {comment['message']}"
+                     for i, comment in enumerate(ticket['comments'], 1))
     else:
-        print("\nNo comments yet.")
+        lines.append("\nNo comments yet.")
     
-    print(f"{'='*40}")
+    lines.append(separator)
+    # Satu write untuk seluruh blok, bukan satu print per baris
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def display_tickets_summary(tickets: List[Dict], title: str):
     """Display summary list of tickets"""
     if not tickets:
         print(f"❌ No {title} found.")
         return
-        
-    print(f"\n📋 {title.upper()} ({len(tickets)}):")
-    for i, ticket in enumerate(tickets, 1):
-        status_icon = "🟢" if ticket["status"] == "new" else "🟡" if ticket["status"] == "in_progress" else "🔵"
-        print(f"{i}. {status_icon} [{ticket['id']}] {ticket['title']} | Priority: {ticket['priority']}")
+    
+    status_icon = _STATUS_ICON.get
+    lines = [f"\n📋 {title.upper()} ({len(tickets)}):"]
+    lines.extend(f"{i}. {status_icon(ticket['status'], '⚪')} [{ticket['id']}] {ticket['title']} | Priority: {ticket['priority']}"
+                 for i, ticket in enumerate(tickets, 1))
+    sys.stdout.write("\n".join(lines) + "\n")
 
 # ==================== SEARCH & SORT FLOWS ====================
 def search_tickets_flow():
     """Flow untuk mencari tiket"""
     print("\n🔍 SEARCH TICKETS")
-    keyword = input("Enter search keyword: ").strip()
+    keyword = _ask("Enter search keyword: ")
     
     results = search_tickets(keyword)
     
@@ -340,7 +846,7 @@ def search_tickets_flow():
     display_tickets_summary(results, "search results")
     
     # Tanya user apakah ingin sorting hasil search
-    sort_option = input("\nSort results? (y/n): ").strip().lower()
+    sort_option = _ask("\nSort results? (y/n): ", lower=True)
     if sort_option == 'y':
         results = sort_tickets_flow(results)
     
@@ -363,7 +869,7 @@ def sort_tickets_flow(tickets: List[Dict] = None) -> List[Dict]:
     print("5. By Status")
     print("6. By Title (A-Z)")
     
-    choice = input("Choose sort option (1-6): ").strip()
+    choice = _ask("Choose sort option (1-6): ")
     
     if choice == "1":
         sorted_tickets = sort_tickets(tickets, "date", ascending=False)
@@ -400,7 +906,7 @@ def manage_users_flow():
     print("3. Delete User")
     print("4. Back to Main Menu")
     
-    choice = input("Enter choice (1-4): ").strip()
+    choice = _ask("Enter choice (1-4): ")
     
     if choice == "1":
         register_user()
@@ -421,7 +927,7 @@ def manage_users_flow():
 def delete_ticket_flow():
     """Flow untuk menghapus tiket"""
     print("\n🗑️ DELETE TICKET")
-    ticket_id = input("Enter ticket ID to delete: ").strip()
+    ticket_id = _ask("Enter ticket ID to delete: ")
     
     result = delete_ticket(ticket_id)
     print(f" {result}")
@@ -431,8 +937,7 @@ def delete_my_ticket_flow():
     print("\n🗑️ DELETE MY TICKET")
     
     # Tampilkan tiket user terlebih dahulu
-    tickets = load_tickets()
-    my_tickets = [t for t in tickets if t["reporter"] == CURRENT_USER["username"]]
+    my_tickets = get_tickets_by_reporter(CURRENT_USER["username"])
     
     if not my_tickets:
         print("❌ You don't have any tickets to delete.")
@@ -440,7 +945,7 @@ def delete_my_ticket_flow():
     
     display_tickets_summary(my_tickets, "my tickets")
     
-    ticket_id = input("\nEnter ticket ID to delete: ").strip()
+    ticket_id = _ask("\nEnter ticket ID to delete: ")
     
     # Verifikasi bahwa tiket memang milik user
     ticket = get_ticket(ticket_id)
@@ -459,9 +964,9 @@ def delete_my_ticket_flow():
 def create_ticket_flow():
     """Flow for creating new ticket"""
     print("\n📝 CREATE NEW TICKET")
-    title = input("Title: ").strip()
-    description = input("Description: ").strip()
-    priority = input("Priority (low/medium/high): ").strip().lower()
+    title = _ask("Title: ")
+    description = _ask("Description: ")
+    priority = _ask("Priority (low/medium/high): ", lower=True)
     
     if not all([title, description, priority]):
         print("❌ All fields are required!")
@@ -472,8 +977,7 @@ def create_ticket_flow():
 
 def view_my_tickets_flow():
     """Flow for users to view only their tickets"""
-    tickets = load_tickets()
-    my_tickets = [t for t in tickets if t["reporter"] == CURRENT_USER["username"]]
+    my_tickets = get_tickets_by_reporter(CURRENT_USER["username"])
     
     if not my_tickets:
         print("❌ You don't have any tickets yet.")
@@ -487,10 +991,10 @@ def view_my_tickets_flow():
     print("3. Sort My Tickets")
     print("4. Delete My Ticket")
     
-    choice = input("Choose option (1-4): ").strip()
+    choice = _ask("Choose option (1-4): ")
     
     if choice == "1":
-        ticket_id = input("Enter ticket ID: ").strip()
+        ticket_id = _ask("Enter ticket ID: ")
         ticket = get_ticket(ticket_id)
         if ticket and ticket["reporter"] == CURRENT_USER["username"]:
             display_ticket(ticket)
@@ -519,10 +1023,10 @@ def view_all_tickets_flow():
     print("3. Sort Tickets")
     print("4. Delete Ticket")
     
-    choice = input("Choose option (1-4): ").strip()
+    choice = _ask("Choose option (1-4): ")
     
     if choice == "1":
-        ticket_id = input("Enter ticket ID: ").strip()
+        ticket_id = _ask("Enter ticket ID: ")
         ticket = get_ticket(ticket_id)
         if ticket:
             display_ticket(ticket)
@@ -537,7 +1041,7 @@ def view_all_tickets_flow():
 
 def add_comment_flow():
     """Flow for adding comments to tickets"""
-    ticket_id = input("Ticket ID: ").strip()
+    ticket_id = _ask("Ticket ID: ")
     
     # For regular users, check if they own the ticket
     if CURRENT_USER["role"] == "user":
@@ -546,13 +1050,13 @@ def add_comment_flow():
             print("❌ You can only comment on your own tickets!")
             return
     
-    message = input("Comment: ").strip()
+    message = _ask("Comment: ")
     result = add_comment(ticket_id, CURRENT_USER["username"], message)
     print(f"✅ {result}")
 
 def update_ticket_status_flow():
     """Flow for updating ticket status"""
-    ticket_id = input("Ticket ID: ").strip()
+    ticket_id = _ask("Ticket ID: ")
     
     # For regular users, check if they own the ticket
     if CURRENT_USER["role"] == "user":
@@ -561,7 +1065,7 @@ def update_ticket_status_flow():
             print("❌ You can only update your own tickets!")
             return
     
-    new_status = input("New status (new/in_progress/resolved): ").strip().lower()
+    new_status = _ask("New status (new/in_progress/resolved): ", lower=True)
     result = update_ticket_status(ticket_id, new_status)
     print(f"✅ {result}")
 
@@ -575,20 +1079,58 @@ def generate_reports_flow():
         return
     
     total_tickets = len(tickets)
-    status_count = {}
-    priority_count = {}
-    
-    for ticket in tickets:
-        status = ticket["status"]
-        priority = ticket["priority"]
-        status_count[status] = status_count.get(status, 0) + 1
-        priority_count[priority] = priority_count.get(priority, 0) + 1
+    # Two C-level passes (map + itemgetter) beat one fused Python loop
+    status_count = Counter(map(operator.itemgetter("status"), tickets))
+    priority_count = Counter(map(operator.itemgetter("priority"), tickets))
     
     print(f"Total Tickets: {total_tickets}")
-    print(f"By Status: {status_count}")
-    print(f"By Priority: {priority_count}")
+    print(f"By Status: {dict(status_count)}")
+    print(f"By Priority: {dict(priority_count)}")
+
+def sort_my_tickets_flow():
+    """Flow untuk user mengurutkan tiket mereka sendiri"""
+    sort_tickets_flow(get_tickets_by_reporter(CURRENT_USER["username"]))
 
 # ==================== ROLE-BASED MENU SYSTEM ====================
+_LOGOUT = object()  # Sentinel: leave the menu loop
+
+_ADMIN_ACTIONS = {
+    "1": create_ticket_flow,
+    "2": view_all_tickets_flow,
+    "3": update_ticket_status_flow,
+    "4": add_comment_flow,
+    "5": search_tickets_flow,
+    "6": sort_tickets_flow,
+    "7": delete_ticket_flow,
+    "8": generate_reports_flow,
+    "9": manage_users_flow,
+    "10": _LOGOUT,
+}
+
+_USER_ACTIONS = {
+    "1": create_ticket_flow,
+    "2": view_my_tickets_flow,
+    "3": update_ticket_status_flow,
+    "4": add_comment_flow,
+    "5": search_tickets_flow,
+    # Untuk user, hanya sort ticket mereka sendiri
+    "6": sort_my_tickets_flow,
+    "7": delete_my_ticket_flow,
+    "8": _LOGOUT,
+}
+
+def _run_menu_choice(actions: Dict, choice: str) -> bool:
+    """Dispatch one menu choice; returns False when the user logs out"""
+    action = actions.get(choice)
+    if action is None:
+        print("❌ Invalid choice!")
+    elif action is _LOGOUT:
+        print("🔐 Logging out...")
+        return False
+    else:
+        action()
+    return True
+
 def show_admin_menu():
     """Display menu for admin users"""
     while True:
@@ -605,31 +1147,10 @@ def show_admin_menu():
         print("9. 👤 Manage Users")
         print("10. 🔐 Logout")
         
-        choice = input("\nEnter choice (1-10): ").strip()
+        choice = _ask("\nEnter choice (1-10): ")
         
-        if choice == "1":
-            create_ticket_flow()
-        elif choice == "2":
-            view_all_tickets_flow()
-        elif choice == "3":
-            update_ticket_status_flow()
-        elif choice == "4":
-            add_comment_flow()
-        elif choice == "5":
-            search_tickets_flow()
-        elif choice == "6":
-            sort_tickets_flow()
-        elif choice == "7":
-            delete_ticket_flow()
-        elif choice == "8":
-            generate_reports_flow()
-        elif choice == "9":
-            manage_users_flow()
-        elif choice == "10":
-            print("🔐 Logging out...")
+        if not _run_menu_choice(_ADMIN_ACTIONS, choice):
             break
-        else:
-            print("❌ Invalid choice!")
 
 def show_user_menu():
     """Display menu for regular users"""
@@ -645,29 +1166,10 @@ def show_user_menu():
         print("7. 🗑️ Delete My Ticket")
         print("8. 🔐 Logout")
         
-        choice = input("\nEnter choice (1-8): ").strip()
+        choice = _ask("\nEnter choice (1-8): ")
         
-        if choice == "1":
-            create_ticket_flow()
-        elif choice == "2":
-            view_my_tickets_flow()
-        elif choice == "3":
-            update_ticket_status_flow()
-        elif choice == "4":
-            add_comment_flow()
-        elif choice == "5":
-            search_tickets_flow()
-        elif choice == "6":
-            # Untuk user, hanya sort ticket mereka sendiri
-            my_tickets = [t for t in load_tickets() if t["reporter"] == CURRENT_USER["username"]]
-            sort_tickets_flow(my_tickets)
-        elif choice == "7":
-            delete_my_ticket_flow()
-        elif choice == "8":
-            print("🔐 Logging out...")
+        if not _run_menu_choice(_USER_ACTIONS, choice):
             break
-        else:
-            print("❌ Invalid choice!")
 
 # ==================== MAIN APPLICATION ====================
 def main():
@@ -677,15 +1179,16 @@ def main():
     print("🚀 SIMPLE HELP DESK SYSTEM")
     print("With Search, Sort, Delete & User Management")
     
-    # Initialize default users
+    # Initialize default users and warm both caches before the first menu
     initialize_users()
+    load_tickets()
     
     while True:
         print("\n" + "="*30)
         print("1. Login")
         print("2. Exit")
         
-        choice = input("\nEnter choice (1-2): ").strip()
+        choice = _ask("\nEnter choice (1-2): ")
         
         if choice == "1":
             CURRENT_USER = authenticate_user()
@@ -702,5 +1205,23 @@ def main():
         else:
             print("❌ Invalid choice!")
 
+def print_tickets_pretty() -> int:
+    """Print all tickets as indented JSON (the files themselves are stored compact); returns the exit status"""
+    # Replay only: load_tickets() could migrate or compact the files on disk
+    try:
+        tickets = _read_tickets(TICKETS_FILE)
+    except ValueError:  # corrupt legacy tickets.json (torn journal lines are skipped)
+        print(f"❌ Could not read tickets: {LEGACY_TICKETS_FILE} is not valid JSON", file=sys.stderr)
+        return 1
+    print(json.dumps(tickets, indent=2, ensure_ascii=False))
+    return 0
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Simple help desk ticketing system (CLI)")
+    parser.add_argument("--pretty", action="store_true",
+                        help="print the stored tickets as indented JSON and exit")
+    args = parser.parse_args()
+    if args.pretty:
+        sys.exit(print_tickets_pretty())
+    else:
+        main()
\ No newline at end of file